@@ -1,6 +1,7 @@
   
 import os
 import os 
+import datetime
 # For Streamlit Cloud: Do NOT force duckdb backend, let CHROMA_DB_IMPL be set by environment variable.
 # To use ChromaDB on Streamlit Cloud, set CHROMA_DB_IMPL=postgres and provide PostgreSQL credentials in app secrets or environment variables.
 os.environ["CHROMA_DB_IMPL"] = os.getenv("CHROMA_DB_IMPL", "duckdb")  # Default to duckdb if not set 
@@ -8,6 +9,7 @@ import streamlit as st
 from crewai import Agent, Task, Crew, LLM
 from crewai_tools import SerperDevTool 
 from langchain_openai import ChatOpenAI
+from exports import compute_plan_hash, build_plan_pdf, build_plan_ics
 
 # Fetch API keys from Streamlit secrets (for Streamlit Cloud) or environment (for local dev)
 def get_secret(key, default=None):
@@ -169,6 +171,17 @@ def run_nutrition_advisor(user_info):
         st.error(f"An error occurred: {str(e)}")
         return None
 
+# --- Export pipeline (PDF + ICS), cached by plan hash ---
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_plan_pdf(plan_hash, _plan_text, _meal_plan_df, _macro_data, _hydration_data):
+    """Render the plan, meal table and charts to PDF bytes, cached by plan hash."""
+    return build_plan_pdf(_plan_text, _meal_plan_df, _macro_data, _hydration_data)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_plan_ics(plan_hash, start_date, _meal_plan_df, _hydration_data):
+    """Render the reminder calendar to ICS bytes, cached by plan hash and start date."""
+    return build_plan_ics(plan_hash, _meal_plan_df, _hydration_data, start_date)
+
 def app():
     import base64
     # --- Sidebar Logo with Unique Style and Animation ---
@@ -561,6 +574,11 @@ def app():
             new_meal = st.text_input("New meal name")
             if st.button("Swap Meal"):
                 st.session_state['meal_plan_df'].iloc[swap_idx, 1] = new_meal
+                if 'plan_result' in st.session_state:
+                    st.session_state['plan_hash'] = compute_plan_hash(
+                        st.session_state['plan_result'], st.session_state['meal_plan_df'],
+                        st.session_state['macro_data'], st.session_state['hydration_data']
+                    )
                 st.success(f"Meal at row {swap_idx} swapped!")
         else:
             st.warning("Generate a plan to see analytics and customization options.")
@@ -602,8 +620,6 @@ def app():
         if result:
             result_str = str(result)
             st.success("✅ Your personalized nutrition plan is ready!")
-            st.markdown("## Your Personalized Nutrition Plan")
-            st.markdown(result_str)
             # --- Analytics & Customization Data (Mock for now) ---
             import pandas as pd
             # Mock meal plan table
@@ -626,29 +642,39 @@ def app():
             hydration_data = pd.DataFrame({"Water(L)": [2, 2, 2, 2, 2, 2, 2]}, index=[f"Day {i+1}" for i in range(7)])
             st.session_state['hydration_data'] = hydration_data
             # --- End Analytics & Customization Data ---
-            # --- Export Buttons ---
-            st.download_button(
-                label="Download Nutrition Plan (Markdown)",
-                data=result_str,
-                file_name="my_nutrition_plan.md",
-                mime="text/markdown"
-            )
-            # PDF Export (mock)
-            st.download_button(
-                label="Download Nutrition Plan (PDF)",
-                data="PDF export coming soon!",
-                file_name="my_nutrition_plan.pdf",
-                mime="application/pdf"
-            )
-            # Google Calendar Export (mock)
-            st.download_button(
-                label="Add Reminders to Google Calendar (.ics)",
-                data="ICS export coming soon!",
-                file_name="nutrition_reminders.ics",
-                mime="text/calendar"
-            )
-            # Email input for reminders (mock)
-            st.text_input("Enter your email for meal/hydration reminders (feature coming soon)")
+            # Keep the plan across reruns so the exports below survive download clicks
+            st.session_state['plan_result'] = result_str
+            st.session_state['plan_hash'] = compute_plan_hash(result_str, meal_plan_df, macro_data, hydration_data)
+
+    if 'plan_result' in st.session_state:
+        result_str = st.session_state['plan_result']
+        plan_hash = st.session_state['plan_hash']
+        meal_plan_df = st.session_state['meal_plan_df']
+        hydration_data = st.session_state['hydration_data']
+        st.markdown("## Your Personalized Nutrition Plan")
+        st.markdown(result_str)
+        # --- Export Buttons ---
+        st.download_button(
+            label="Download Nutrition Plan (Markdown)",
+            data=result_str,
+            file_name="my_nutrition_plan.md",
+            mime="text/markdown"
+        )
+        # PDF / Calendar Export (cached by plan hash so reruns never re-render)
+        st.download_button(
+            label="Download Nutrition Plan (PDF)",
+            data=render_plan_pdf(plan_hash, result_str, meal_plan_df, st.session_state['macro_data'], hydration_data),
+            file_name="my_nutrition_plan.pdf",
+            mime="application/pdf"
+        )
+        st.download_button(
+            label="Add Reminders to Google Calendar (.ics)",
+            data=render_plan_ics(plan_hash, datetime.date.today() + datetime.timedelta(days=1), meal_plan_df, hydration_data),
+            file_name="nutrition_reminders.ics",
+            mime="text/calendar"
+        )
+        # Email input for reminders (mock)
+        st.text_input("Enter your email for meal/hydration reminders (feature coming soon)")
 
 if __name__ == "__main__":
     app()
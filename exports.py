@@ -0,0 +1,250 @@
+"""PDF and ICS export helpers for the generated nutrition plan.
+
+Kept free of Streamlit so the renderers can be cached by plan hash in cloud.py
+and exercised on their own.
+"""
+import datetime
+import hashlib
+import re
+
+
+# Reminder times for the meals of each day, in the order they appear in the plan table.
+MEAL_REMINDER_TIMES = [(8, 0, "Breakfast"), (13, 0, "Lunch"), (19, 0, "Dinner")]
+SNACK_REMINDER_TIME = (16, 0, "Snack")
+HYDRATION_REMINDER_TIMES = [(9, 0), (11, 0), (15, 0), (17, 0)]
+CHART_TITLE_HEIGHT = 8
+CHART_LABEL_HEIGHT = 8
+
+def compute_plan_hash(plan_text, meal_plan_df, macro_data, hydration_data):
+    """Return a stable hash of the generated plan and its analytics data."""
+    digest = hashlib.sha256()
+    digest.update(plan_text.encode("utf-8"))
+    for frame in (meal_plan_df, macro_data, hydration_data):
+        digest.update(b"\0")
+        digest.update(frame.to_csv().encode("utf-8"))
+    return digest.hexdigest()
+
+def _pdf_text(text):
+    """Map text onto the Latin-1 range supported by the built-in PDF fonts.
+
+    The core fonts cannot draw anything outside Latin-1 (e.g. ₹, arrows, emoji or
+    Devanagari), so common punctuation is transliterated and any other such
+    character is shown as "?" rather than silently dropped.
+    """
+    replacements = {
+        "\u2022": "-", "\u2013": "-", "\u2014": "-", "\u2018": "'", "\u2019": "'",
+        "\u201c": '"', "\u201d": '"', "\u2026": "...", "\u00a0": " ",
+    }
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def _pdf_plan_text(pdf, plan_text):
+    """Render the markdown plan as headings, bullets and paragraphs."""
+    for raw_line in plan_text.splitlines():
+        line = _pdf_text(raw_line.strip()).replace("**", "").replace("__", "")
+        if not line:
+            pdf.ln(3)
+            continue
+        if line.startswith("#"):
+            level = min(len(line) - len(line.lstrip("#")), 3)
+            pdf.set_font("Helvetica", "B", 16 - 2 * level)
+            pdf.multi_cell(0, 8, line.lstrip("#").strip(), new_x="LMARGIN", new_y="NEXT")
+            pdf.set_font("Helvetica", "", 10)
+        elif line[:2] in ("- ", "* "):
+            pdf.multi_cell(0, 5, "  - " + line[2:], new_x="LMARGIN", new_y="NEXT")
+        else:
+            pdf.multi_cell(0, 5, line, new_x="LMARGIN", new_y="NEXT")
+
+def _pdf_meal_table(pdf, meal_plan_df, line_height=6):
+    """Render the meal plan DataFrame as a bordered table, wrapping long cells."""
+    columns = list(meal_plan_df.columns)
+    wide_width = 60 if "Meal" in columns else 0
+    narrow_count = len(columns) - (1 if wide_width else 0)
+    narrow_width = (pdf.epw - wide_width) / max(narrow_count, 1)
+    widths = [wide_width if column == "Meal" else narrow_width for column in columns]
+
+    def draw_header():
+        pdf.set_font("Helvetica", "B", 9)
+        pdf.set_fill_color(230, 240, 250)
+        for column, width in zip(columns, widths):
+            pdf.cell(width, 7, _pdf_text(str(column)), border=1, align="C", fill=True)
+        pdf.ln()
+        pdf.set_font("Helvetica", "", 9)
+
+    draw_header()
+    for row in meal_plan_df.itertuples(index=False):
+        texts = [_pdf_text(str(value)) for value in row]
+        line_counts = [
+            len(pdf.multi_cell(width, line_height, text, dry_run=True, output="LINES"))
+            for text, width in zip(texts, widths)
+        ]
+        row_height = line_height * max(line_counts + [1])
+        # Start a new page (with the header repeated) instead of letting fpdf2 split a row.
+        if pdf.will_page_break(row_height):
+            pdf.add_page()
+            draw_header()
+        top = pdf.get_y()
+        for text, width in zip(texts, widths):
+            left = pdf.get_x()
+            pdf.rect(left, top, width, row_height)
+            pdf.multi_cell(width, line_height, text, new_x="RIGHT", new_y="TOP")
+            pdf.set_xy(left + width, top)
+        pdf.set_xy(pdf.l_margin, top + row_height)
+
+
+def _pdf_bar_chart(pdf, title, labels, values, height=50):
+    """Draw a simple vertical bar chart with PDF primitives."""
+    # rect/line/text never trigger fpdf2's auto page break, so keep the chart on one page.
+    if pdf.will_page_break(CHART_TITLE_HEIGHT + height + CHART_LABEL_HEIGHT):
+        pdf.add_page()
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, CHART_TITLE_HEIGHT, _pdf_text(title), new_x="LMARGIN", new_y="NEXT")
+    top = pdf.get_y()
+    left = pdf.l_margin
+    peak = max(values) if values and max(values) > 0 else 1
+    slot = pdf.epw / max(len(values), 1)
+    bar_width = slot * 0.6
+    pdf.set_font("Helvetica", "", 8)
+    pdf.set_fill_color(0, 150, 200)
+    for i, (label, value) in enumerate(zip(labels, values)):
+        bar_height = height * value / peak
+        x = left + i * slot + (slot - bar_width) / 2
+        pdf.rect(x, top + height - bar_height, bar_width, bar_height, style="F")
+        pdf.text(x, top + height - bar_height - 1, f"{value:g}")
+        pdf.text(x, top + height + 4, _pdf_text(str(label)))
+    pdf.line(left, top + height, left + pdf.epw, top + height)
+    pdf.set_y(top + height + CHART_LABEL_HEIGHT)
+
+def _pdf_line_chart(pdf, title, labels, values, height=40):
+    """Draw a simple line chart with PDF primitives."""
+    if pdf.will_page_break(CHART_TITLE_HEIGHT + height + CHART_LABEL_HEIGHT):
+        pdf.add_page()
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, CHART_TITLE_HEIGHT, _pdf_text(title), new_x="LMARGIN", new_y="NEXT")
+    top = pdf.get_y()
+    left = pdf.l_margin
+    peak = max(values) if values and max(values) > 0 else 1
+    step = pdf.epw / max(len(values) - 1, 1)
+    points = [(left + i * step, top + height - height * value / peak) for i, value in enumerate(values)]
+    pdf.set_draw_color(0, 150, 200)
+    for start, end in zip(points, points[1:]):
+        pdf.line(start[0], start[1], end[0], end[1])
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_font("Helvetica", "", 8)
+    for (x, y), label, value in zip(points, labels, values):
+        pdf.text(x, y - 1, f"{value:g}")
+        pdf.text(x, top + height + 4, _pdf_text(str(label)))
+    pdf.line(left, top + height, left + pdf.epw, top + height)
+    pdf.set_y(top + height + CHART_LABEL_HEIGHT)
+
+def build_plan_pdf(plan_text, meal_plan_df, macro_data, hydration_data):
+    """Render the plan, meal table and charts to PDF bytes."""
+    from fpdf import FPDF
+
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.set_title("SehaatSaathi Nutrition Plan")
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 18)
+    pdf.cell(0, 10, "Your Personalized Nutrition Plan", new_x="LMARGIN", new_y="NEXT", align="C")
+    pdf.set_font("Helvetica", "", 10)
+    _pdf_plan_text(pdf, plan_text)
+
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.cell(0, 10, "7-Day Meal Plan Table", new_x="LMARGIN", new_y="NEXT")
+    _pdf_meal_table(pdf, meal_plan_df)
+    pdf.ln(6)
+    macro_row = macro_data.iloc[0]
+    _pdf_bar_chart(pdf, "Macronutrient Breakdown (g)", list(macro_data.columns), [float(v) for v in macro_row])
+    water = hydration_data.iloc[:, 0]
+    _pdf_line_chart(pdf, "Hydration Schedule (L)", list(water.index), [float(v) for v in water])
+
+    return bytes(pdf.output())
+
+def _ics_escape(text):
+    """Escape a TEXT value as required by RFC 5545."""
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+def _ics_fold(line):
+    """Fold a content line at 75 octets, as required by RFC 5545."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, current, size = [], "", 0
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > 75:
+            parts.append(current)
+            current, size = "", 1  # continuation lines start with a space
+        current += char
+        size += char_size
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+def _day_number(label, position, day_count):
+    """Turn a 'Day N' label into N.
+
+    Falls back to the 1-based position of the day when the label has no number
+    or its first number is outside 1..day_count (e.g. an ISO date).
+    """
+    match = re.search(r"\d+", str(label))
+    day = int(match.group()) if match else 0
+    return day if 1 <= day <= day_count else position
+
+def iter_ics_events(plan_hash, meal_plan_df, hydration_data, start_date):
+    """Yield (uid, start, minutes, summary, description) for every reminder in the plan."""
+    meals_seen = {}
+    day_positions = {}
+    meal_day_count = meal_plan_df.iloc[:, 0].nunique()
+    for index, row in enumerate(meal_plan_df.itertuples(index=False)):
+        day = _day_number(row[0], day_positions.setdefault(row[0], len(day_positions) + 1), meal_day_count)
+        slot = meals_seen.get(day, 0)
+        meals_seen[day] = slot + 1
+        hour, minute, name = MEAL_REMINDER_TIMES[slot] if slot < len(MEAL_REMINDER_TIMES) else SNACK_REMINDER_TIME
+        start = datetime.datetime.combine(start_date + datetime.timedelta(days=day - 1), datetime.time(hour, minute))
+        details = ", ".join(f"{col}: {val}" for col, val in zip(meal_plan_df.columns[2:], row[2:]))
+        yield f"{plan_hash[:16]}-meal-{index}", start, 30, f"{name}: {row[1]}", details
+    for position, (day_label, liters) in enumerate(hydration_data.iloc[:, 0].items()):
+        day = _day_number(day_label, position + 1, len(hydration_data))
+        per_reminder = float(liters) / len(HYDRATION_REMINDER_TIMES)
+        for slot, (hour, minute) in enumerate(HYDRATION_REMINDER_TIMES):
+            start = datetime.datetime.combine(start_date + datetime.timedelta(days=day - 1), datetime.time(hour, minute))
+            yield (
+                f"{plan_hash[:16]}-water-{position}-{slot}", start, 10,
+                f"Hydration: drink {per_reminder:.2g} L",
+                f"Daily water target for {day_label}: {float(liters):g} L",
+            )
+
+def iter_ics_lines(plan_hash, meal_plan_df, hydration_data, start_date):
+    """Yield the CRLF-terminated lines of an ICS calendar of meal and hydration reminders."""
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    header = [
+        "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//SehaatSaathi//Nutrition Reminders//EN",
+        "CALSCALE:GREGORIAN", "METHOD:PUBLISH", "X-WR-CALNAME:SehaatSaathi Nutrition Reminders",
+    ]
+    for line in header:
+        yield line + "\r\n"
+    for uid, start, minutes, summary, description in iter_ics_events(plan_hash, meal_plan_df, hydration_data, start_date):
+        end = start + datetime.timedelta(minutes=minutes)
+        event = [
+            "BEGIN:VEVENT",
+            f"UID:{uid}@sehaatsaathi",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}",
+            f"SUMMARY:{_ics_escape(summary)}",
+            f"DESCRIPTION:{_ics_escape(description)}",
+            "BEGIN:VALARM", "ACTION:DISPLAY", f"DESCRIPTION:{_ics_escape(summary)}", "TRIGGER:-PT5M", "END:VALARM",
+            "END:VEVENT",
+        ]
+        for line in event:
+            yield _ics_fold(line) + "\r\n"
+    yield "END:VCALENDAR\r\n"
+
+def build_plan_ics(plan_hash, meal_plan_df, hydration_data, start_date):
+    """Render the reminder calendar to ICS bytes."""
+    return "".join(iter_ics_lines(plan_hash, meal_plan_df, hydration_data, start_date)).encode("utf-8")
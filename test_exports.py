@@ -0,0 +1,140 @@
+import datetime
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import exports
+
+COLUMNS = ["Day", "Meal", "Calories", "Protein", "Carbs", "Fat", "Water(L)"]
+START = datetime.date(2026, 1, 1)
+
+
+def make_plan(days=7, meals_per_day=4):
+    rows = [[f"Day {d}", f"Meal {d}-{m}", 300, 10, 20, 5, 1]
+            for d in range(1, days + 1) for m in range(meals_per_day)]
+    meal_plan_df = pd.DataFrame(rows, columns=COLUMNS)
+    macro_data = pd.DataFrame({"Protein": [120], "Carbs": [270], "Fat": [75]})
+    hydration_data = pd.DataFrame({"Water(L)": [2] * days}, index=[f"Day {i + 1}" for i in range(days)])
+    return meal_plan_df, macro_data, hydration_data
+
+
+def test_ics_escape():
+    assert exports._ics_escape("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+def test_ics_fold_keeps_lines_at_limit():
+    line = "x" * 75
+    assert exports._ics_fold(line) == line
+    assert exports._ics_fold("x" * 76) == "x" * 75 + "\r\n x"
+
+
+def test_ics_fold_never_splits_multibyte_characters():
+    line = "SUMMARY:" + "é" * 80
+    folded = exports._ics_fold(line)
+    for physical in folded.split("\r\n"):
+        assert len(physical.encode("utf-8")) <= 75
+    assert folded.replace("\r\n ", "") == line
+
+
+def test_pdf_text_marks_characters_outside_latin1():
+    assert exports._pdf_text("\u2022 Costs \u20b9200 \u2014 caf\u00e9 \u0926\u093e\u0932") == "- Costs ?200 - caf\u00e9 ???"
+
+
+def test_plan_hash_is_stable_and_tracks_swaps():
+    meal_plan_df, macro_data, hydration_data = make_plan()
+    first = exports.compute_plan_hash("plan", meal_plan_df, macro_data, hydration_data)
+    again = exports.compute_plan_hash("plan", meal_plan_df.copy(), macro_data.copy(), hydration_data.copy())
+    assert first == again
+    meal_plan_df.iloc[0, 1] = "Swapped"
+    assert exports.compute_plan_hash("plan", meal_plan_df, macro_data, hydration_data) != first
+    assert exports.compute_plan_hash("other", *make_plan()) != first
+
+
+def test_ics_events_map_meal_slots_and_days():
+    meal_plan_df, _, hydration_data = make_plan(days=2)
+    events = list(exports.iter_ics_events("abc", meal_plan_df, hydration_data, START))
+    meals = [e for e in events if "-meal-" in e[0]]
+    assert [(e[1], e[3].split(":")[0]) for e in meals[:4]] == [
+        (datetime.datetime(2026, 1, 1, 8, 0), "Breakfast"),
+        (datetime.datetime(2026, 1, 1, 13, 0), "Lunch"),
+        (datetime.datetime(2026, 1, 1, 19, 0), "Dinner"),
+        (datetime.datetime(2026, 1, 1, 16, 0), "Snack"),
+    ]
+    assert meals[4][1] == datetime.datetime(2026, 1, 2, 8, 0)
+    assert len(events) == 8 + 2 * len(exports.HYDRATION_REMINDER_TIMES)
+
+
+def test_ics_events_place_unnumbered_days_by_position():
+    meal_plan_df = pd.DataFrame(
+        [["Mon", "A", 1, 1, 1, 1, 1], ["Mon", "B", 1, 1, 1, 1, 1], ["Tue", "C", 1, 1, 1, 1, 1]], columns=COLUMNS
+    )
+    hydration_data = pd.DataFrame({"Water(L)": [2, 3]}, index=["Mon", "Tue"])
+    events = list(exports.iter_ics_events("abc", meal_plan_df, hydration_data, START))
+    assert [e[1].date() for e in events[:3]] == [START, START, START + datetime.timedelta(days=1)]
+    assert events[-1][1].date() == START + datetime.timedelta(days=1)
+    assert len({e[0] for e in events}) == len(events)
+
+
+@pytest.mark.parametrize("label, expected", [
+    ("Day 3", 3),
+    ("Day 10 (week 2)", 10),
+    ("Week 1 Day 3", 1),
+    ("2026-01-05", 4),
+    ("Day 0", 4),
+    ("Monday", 4),
+])
+def test_day_number_uses_first_number_within_range(label, expected):
+    assert exports._day_number(label, 4, 14) == expected
+
+
+def test_ics_events_fall_back_for_iso_date_labels():
+    meal_plan_df = pd.DataFrame(
+        [["2026-01-05", "A", 1, 1, 1, 1, 1], ["2026-01-06", "B", 1, 1, 1, 1, 1]], columns=COLUMNS
+    )
+    hydration_data = pd.DataFrame({"Water(L)": [2, 2]}, index=["2026-01-05", "2026-01-06"])
+    events = list(exports.iter_ics_events("abc", meal_plan_df, hydration_data, START))
+    assert [e[1].date() for e in events[:2]] == [START, START + datetime.timedelta(days=1)]
+    assert events[-1][1].date() == START + datetime.timedelta(days=1)
+
+
+def test_build_plan_ics_is_a_crlf_calendar():
+    meal_plan_df, _, hydration_data = make_plan()
+    data = exports.build_plan_ics("abc", meal_plan_df, hydration_data, START).decode("utf-8")
+    assert data.startswith("BEGIN:VCALENDAR\r\n")
+    assert data.endswith("END:VCALENDAR\r\n")
+    assert data.count("BEGIN:VEVENT") == data.count("END:VEVENT") == 28 + 7 * 4
+    assert "\n" not in data.replace("\r\n", "")
+
+
+def test_build_plan_pdf_keeps_charts_on_the_page(monkeypatch):
+    fpdf = pytest.importorskip("fpdf")
+    positions = []
+    original_text = fpdf.FPDF.text
+
+    def recording_text(self, x, y, text=""):
+        positions.append((y, self.h - self.b_margin))
+        return original_text(self, x, y, text)
+
+    monkeypatch.setattr(fpdf.FPDF, "text", recording_text)
+    data = exports.build_plan_pdf("# Plan\n- item", *make_plan())
+    assert data.startswith(b"%PDF")
+    assert positions
+    assert all(y <= limit for y, limit in positions)
+
+
+def test_meal_table_wraps_long_swapped_meal_names():
+    fpdf = pytest.importorskip("fpdf")
+    long_name = "Grilled paneer tikka with mint chutney, brown rice and cucumber raita"
+    meal_plan_df, _, _ = make_plan(days=1, meals_per_day=2)
+    meal_plan_df.iloc[0, 1] = long_name
+    pdf = fpdf.FPDF(format="A4")
+    pdf.add_page()
+    top = pdf.get_y()
+    exports._pdf_meal_table(pdf, meal_plan_df)
+    pdf.set_font("Helvetica", "", 9)
+    lines = pdf.multi_cell(60, 6, long_name, dry_run=True, output="LINES")
+    assert len(lines) > 1
+    assert all(pdf.get_string_width(line) <= 60 for line in lines)
+    # Header row, the wrapped row and one single-line row.
+    assert pdf.get_y() == pytest.approx(top + 7 + 6 * len(lines) + 6)